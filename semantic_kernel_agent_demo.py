@@ -4,12 +4,13 @@ import asyncio
 import os
 from typing import Final
 
+import httpx
 from dotenv import load_dotenv
 
 from semantic_kernel.agents.group_chat.agent_group_chat import AgentGroupChat
 from semantic_kernel.agents.open_ai.azure_assistant_agent import AzureAssistantAgent
 from openai import AsyncAzureOpenAI
-from semantic_kernel.contents import AuthorRole
+from semantic_kernel.contents import ChatMessageContent, TextContent
 
 
 DEFAULT_PROMPT: Final[str] = "Give me a concise update on the RAG concept in AI."
@@ -17,6 +18,13 @@ ASSISTANT_NAME: Final[str] = "sk-quickstart-demo"
 ASSISTANT_INSTRUCTIONS: Final[str] = "You are a helpful Azure AI demo assistant. Keep answers short."  # noqa: E501
 
 
+# Shared across runs on the same event loop so the underlying HTTP connection
+# pool (and its TLS handshakes) is paid for once, not once per invocation.
+# Keyed by loop because httpx transports cannot outlive the loop they were
+# created on.
+_client_cache: dict[asyncio.AbstractEventLoop, tuple[AsyncAzureOpenAI, str]] = {}
+
+
 def _build_client() -> tuple[AsyncAzureOpenAI, str]:
     """Create an AsyncAzureOpenAI client using environment configuration."""
     # Values pulled from env map directly to the Azure OpenAI deployment you want to hit.
@@ -32,14 +40,44 @@ def _build_client() -> tuple[AsyncAzureOpenAI, str]:
         azure_endpoint=endpoint,
         api_key=api_key,
         api_version=api_version,
+        # Keep-alive connections survive between runs, avoiding a fresh TCP + TLS
+        # setup on every chat.
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        ),
     )
 
     return client, deployment
 
 
+async def _get_client() -> tuple[AsyncAzureOpenAI, str]:
+    """Return this loop's shared client and deployment, constructing them on first use."""
+    loop = asyncio.get_running_loop()
+    cached = _client_cache.get(loop)
+    if cached is None:
+        cached = _client_cache[loop] = _build_client()
+    return cached
+
+
+async def _close_client() -> None:
+    """Dispose of this loop's client so its transports shut down on their own loop."""
+    cached = _client_cache.pop(asyncio.get_running_loop(), None)
+    if cached is not None:
+        await cached[0].close()
+
+
+def _message_text(message: ChatMessageContent) -> str:
+    """Extract the text parts of an SK message without its __str__ re-join."""
+    items = getattr(message, "items", None)
+    if items:
+        # TextContent also covers the streaming deltas, which subclass it.
+        return "".join(item.text for item in items if isinstance(item, TextContent))
+    return str(message)
+
+
 async def run_demo(prompt: str) -> None:
     """Kick off a one-turn chat with an Azure OpenAI-powered Semantic Kernel agent."""
-    client, deployment_name = _build_client()
+    client, deployment_name = await _get_client()
 
     assistant_id = os.getenv("AZURE_OPENAI_ASSISTANT_ID")
 
@@ -61,19 +99,31 @@ async def run_demo(prompt: str) -> None:
     await chat.add_chat_message(prompt)
 
     print(f"user: {prompt}")
-    async for message in chat.invoke(agent):
-        role = message.role.value
-        content = str(message).strip()
-        # TOOL messages echo function-call results; skip blank records for readability.
-        if role == AuthorRole.TOOL.value and not content:
+    # invoke_stream surfaces tokens as Azure streams them instead of waiting for
+    # the full completion, so the reply appears as it is generated.
+    content = ""
+    async for chunk in chat.invoke_stream(agent):
+        delta = _message_text(chunk)
+        # TOOL chunks echo function-call results; skip blank records for readability.
+        if not delta:
             continue
-        print(f"{role}: {content}")
+        if not content:
+            print(f"{chunk.role.value}: ", end="", flush=True)
+        content += delta
+        print(delta, end="", flush=True)
+    if content:
+        print()
 
     if not assistant_id and os.getenv("AZURE_OPENAI_KEEP_ASSISTANT", "false").lower() not in {"true", "1", "yes"}:
         # Clean up the temporary Azure OpenAI assistant if we just created it.
         await client.beta.assistants.delete(assistant.id)
 
-    await client.close()
+
+async def _amain(prompt: str) -> None:
+    try:
+        await run_demo(prompt)
+    finally:
+        await _close_client()
 
 
 def main() -> None:
@@ -81,7 +131,7 @@ def main() -> None:
 
     prompt = os.getenv("SEMANTIC_KERNEL_DEMO_PROMPT", DEFAULT_PROMPT)
 
-    asyncio.run(run_demo(prompt))
+    asyncio.run(_amain(prompt))
 
 
 if __name__ == "__main__":
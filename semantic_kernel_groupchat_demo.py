@@ -1,17 +1,24 @@
 """Semantic Kernel group chat demo using Azure OpenAI Assistants."""
 
 import asyncio
+import hashlib
+import json
 import os
+import random
 import sys
-from typing import AsyncIterator, Final, Iterable
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Final, Iterable, TypeVar
 
+import httpx
 from dotenv import load_dotenv
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, NotFoundError, RateLimitError
 from semantic_kernel.agents.group_chat.agent_group_chat import AgentGroupChat
 from semantic_kernel.agents.open_ai.azure_assistant_agent import AzureAssistantAgent
 from semantic_kernel.agents.strategies.selection.sequential_selection_strategy import SequentialSelectionStrategy
 from semantic_kernel.agents.strategies.termination.default_termination_strategy import DefaultTerminationStrategy
-from semantic_kernel.contents import AuthorRole
+from semantic_kernel.contents import AuthorRole, ChatMessageContent, TextContent
 
 
 RESET = "\033[0m"
@@ -23,10 +30,16 @@ COLORS: Final[dict[str, str]] = {
     "editor": "\033[93m",
     "assistant": "\033[96m",
 }
+_DEFAULT_COLOR: Final[str] = COLORS["assistant"]
 
 
 DEFAULT_PROMPT: Final[str] = "Draft a lightweight product launch plan for a new AI-powered note-taking app."
 ASSISTANT_NAMESPACE: Final[str] = "sk-groupchat-demo"
+_NAME_PREFIX: Final[str] = f"{ASSISTANT_NAMESPACE}-"
+_NAME_PREFIX_LEN: Final[int] = len(_NAME_PREFIX)
+# Assistants are a control-plane resource that rarely changes; remembering their
+# ids between runs saves a create + delete round-trip per agent per run.
+ASSISTANT_CACHE_PATH: Final[Path] = Path.home() / ".cache" / "sk-demo" / "assistants.json"
 ASSISTANT_PROFILES: Final[tuple[tuple[str, str], ...]] = (
     (
         "planner",
@@ -43,32 +56,136 @@ ASSISTANT_PROFILES: Final[tuple[tuple[str, str], ...]] = (
         "You synthesize what others proposed into a concise recommendation with next actions and open questions.",
     ),
 )
+# Roles whose opening turn depends only on the user prompt. Their first LLM calls
+# are independent, so they run concurrently instead of waiting on each other;
+# the editor still synthesizes sequentially afterwards.
+PARALLEL_OPENERS: Final[frozenset[str]] = frozenset({"planner", "researcher"})
 
 
-def _build_client() -> tuple[AsyncAzureOpenAI, str]:
-    """Create an AsyncAzureOpenAI client using environment configuration."""
+@dataclass(frozen=True)
+class _Config:
+    """Environment-derived settings, resolved once per process."""
+
+    endpoint: str
+    api_key: str
+    deployment: str
+    api_version: str
+    keep_assistants: bool
+    max_rounds: int
+    max_concurrency: int
+    prompt: str
+
+
+# Resolved lazily after load_dotenv so env vars are read once, not per run.
+_config_singleton: _Config | None = None
+
+# Caps in-flight Azure calls so the concurrent fan-outs stay under the
+# deployment's per-minute quota instead of bursting into 429 backoff. Created
+# lazily like the config so SK_DEMO_MAX_CONCURRENCY from .env is honored.
+_sem_singleton: asyncio.Semaphore | None = None
+
+_T = TypeVar("_T")
+
+# Shared across runs on the same event loop so the underlying HTTP connection
+# pool (and its TLS handshakes) is paid for once, not once per invocation.
+# Keyed by loop because httpx transports cannot outlive the loop they were
+# created on.
+_client_cache: dict[asyncio.AbstractEventLoop, tuple[AsyncAzureOpenAI, str]] = {}
+
+
+def _load_config() -> _Config:
+    """Read the demo's environment variables into an immutable config."""
     # These values point at the Azure OpenAI deployment the demo will call.
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
     api_key = os.getenv("AZURE_OPENAI_API_KEY")
     deployment = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
 
     if not endpoint or not api_key or not deployment:
         raise ValueError(
             "Missing one of AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, AZURE_OPENAI_CHAT_DEPLOYMENT_NAME",
         )
 
-    client = AsyncAzureOpenAI(
-        azure_endpoint=endpoint,
+    return _Config(
+        endpoint=endpoint,
         api_key=api_key,
-        api_version=api_version,
+        deployment=deployment,
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview"),
+        keep_assistants=os.getenv("AZURE_OPENAI_KEEP_ASSISTANT", "false").lower() in {"true", "1", "yes"},
+        max_rounds=int(os.getenv("SEMANTIC_KERNEL_GROUPCHAT_MAX_ITERATIONS", "4")),
+        max_concurrency=int(os.getenv("SK_DEMO_MAX_CONCURRENCY", "8")),
+        prompt=os.getenv("SEMANTIC_KERNEL_GROUPCHAT_PROMPT", DEFAULT_PROMPT),
+    )
+
+
+def _get_config() -> _Config:
+    """Return the shared config, loading it on first use."""
+    global _config_singleton
+    if _config_singleton is None:
+        _config_singleton = _load_config()
+    return _config_singleton
+
+
+def _build_client(cfg: _Config) -> tuple[AsyncAzureOpenAI, str]:
+    """Create an AsyncAzureOpenAI client from the resolved configuration."""
+    client = AsyncAzureOpenAI(
+        azure_endpoint=cfg.endpoint,
+        api_key=cfg.api_key,
+        api_version=cfg.api_version,
+        # Keep-alive connections survive between runs, avoiding a fresh TCP + TLS
+        # setup on every chat.
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        ),
     )
 
-    return client, deployment
+    return client, cfg.deployment
+
+
+async def _get_client() -> tuple[AsyncAzureOpenAI, str]:
+    """Return this loop's shared client and deployment, constructing them on first use."""
+    loop = asyncio.get_running_loop()
+    cached = _client_cache.get(loop)
+    if cached is None:
+        cached = _client_cache[loop] = _build_client(_get_config())
+    return cached
+
+
+async def _close_client() -> None:
+    """Dispose of this loop's client so its transports shut down on their own loop."""
+    cached = _client_cache.pop(asyncio.get_running_loop(), None)
+    if cached is not None:
+        await cached[0].close()
+
 
+def _get_sem() -> asyncio.Semaphore:
+    """Return the shared concurrency gate, creating it on first use."""
+    global _sem_singleton
+    if _sem_singleton is None:
+        _sem_singleton = asyncio.Semaphore(_get_config().max_concurrency)
+    return _sem_singleton
 
+
+async def _throttled(call: Callable[[], Awaitable[_T]], *, attempts: int = 5) -> _T:
+    """Run an outbound Azure call under the concurrency gate, retrying on 429."""
+    async with _get_sem():
+        for attempt in range(attempts):
+            try:
+                return await call()
+            except RateLimitError:
+                if attempt == attempts - 1:
+                    raise
+                # Exponential backoff with jitter so retries do not re-burst.
+                await asyncio.sleep(min(2**attempt, 30) * (0.5 + random.random()))
+    raise AssertionError("unreachable")
+
+
+@lru_cache(maxsize=1)
 def _supports_color() -> bool:
-    """Return True when stdout can render ANSI colors."""
+    """Return True when stdout can render ANSI colors.
+
+    Neither NO_COLOR nor the tty status changes within a process, so the answer
+    is computed once rather than per transcript entry.
+    """
     if os.getenv("NO_COLOR") is not None:
         return False
     return sys.stdout.isatty()
@@ -76,50 +193,128 @@ def _supports_color() -> bool:
 
 def _indent(text: str) -> str:
     """Indent multiline content for readability."""
-    return "\n".join(f"  {line}" if line else "  " for line in text.splitlines())
+    # A single C-level str.replace beats a per-line Python loop on long transcripts.
+    return "  " + text.replace("\n", "\n  ")
+
+
+def _colorize_label(label: str, *, color_key: str) -> str:
+    """Wrap the label with color when supported."""
+    if not _supports_color():
+        return label
+    color = COLORS.get(color_key, _DEFAULT_COLOR)
+    return f"{color}{label}{RESET}"
 
 
 def _colorize(label: str, content: str, *, color_key: str) -> str:
     """Wrap the label and content with color and indentation when supported."""
-    if not _supports_color():
-        return f"{label}\n{_indent(content)}"
+    return f"{_colorize_label(label, color_key=color_key)}\n{_indent(content)}"
 
-    color = COLORS.get(color_key, COLORS["assistant"])
-    colored_label = f"{color}{label}{RESET}"
-    return f"{colored_label}\n{_indent(content)}"
+
+def _message_text(message: ChatMessageContent) -> str:
+    """Extract the text parts of an SK message without its __str__ re-join."""
+    items = getattr(message, "items", None)
+    if items:
+        # TextContent also covers the streaming deltas, which subclass it.
+        return "".join(item.text for item in items if isinstance(item, TextContent))
+    return str(message)
 
 
 def _normalize_name(name: str | None) -> str:
     """Map assistant identifiers to a short display name."""
     if not name:
         return "assistant"
-    if name.startswith(f"{ASSISTANT_NAMESPACE}-"):
-        return name.removeprefix(f"{ASSISTANT_NAMESPACE}-")
+    if name.startswith(_NAME_PREFIX):
+        return name[_NAME_PREFIX_LEN:]
     return name
 
 
+def _assistant_cache_key(name: str, instructions: str, model: str) -> str:
+    """Key assistants by their full definition so edits force a re-create."""
+    return hashlib.sha256(f"{name}\n{instructions}\n{model}".encode()).hexdigest()
+
+
+def _load_assistant_cache() -> dict[str, str]:
+    """Load the cached assistant ids, returning an empty mapping when absent."""
+    try:
+        return json.loads(ASSISTANT_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_assistant_cache(cache: dict[str, str]) -> bool:
+    """Persist the assistant-id cache; return False when the write fails."""
+    try:
+        ASSISTANT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ASSISTANT_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        return False
+    return True
+
+
 async def _build_agents(
     *,
     client: AsyncAzureOpenAI,
     model: str,
     profiles: Iterable[tuple[str, str]],
 ) -> tuple[list[AzureAssistantAgent], list[str]]:
-    """Create Azure Assistant agents for the supplied profiles."""
-    agents: list[AzureAssistantAgent] = []
-    assistant_ids: list[str] = []
-
-    for short_name, instructions in profiles:
+    """Resolve Azure Assistant agents for the supplied profiles.
+
+    Returns the agents plus the ids of assistants that could not be recorded in
+    the on-disk cache and therefore still need to be cleaned up by the caller.
+    """
+    cache = _load_assistant_cache()
+
+    async def _resolve(short_name: str, instructions: str):
+        name = f"{ASSISTANT_NAMESPACE}-{short_name}"
+        key = _assistant_cache_key(name, instructions, model)
+        cached_id = cache.get(key)
+        if cached_id:
+            try:
+                return key, await _throttled(partial(client.beta.assistants.retrieve, cached_id))
+            except NotFoundError:
+                # Stale entry: the assistant was deleted out-of-band; recreate it.
+                pass
         # Assistant definitions are stored and executed inside Azure OpenAI.
-        assistant = await client.beta.assistants.create(
-            model=model,
-            name=f"{ASSISTANT_NAMESPACE}-{short_name}",
-            instructions=instructions,
+        assistant = await _throttled(
+            partial(
+                client.beta.assistants.create,
+                model=model,
+                name=name,
+                instructions=instructions,
+            ),
         )
-        # Semantic Kernel wraps each assistant so they can be orchestrated uniformly.
-        agents.append(AzureAssistantAgent(client=client, definition=assistant))
-        assistant_ids.append(assistant.id)
-
-    return agents, assistant_ids
+        return key, assistant
+
+    # Resolution is network-latency-bound, so issue every request concurrently
+    # and pay roughly one round-trip instead of one per profile.
+    resolved = await asyncio.gather(*(_resolve(short_name, instructions) for short_name, instructions in profiles))
+
+    created = {key: assistant.id for key, assistant in resolved if cache.get(key) != assistant.id}
+    if created:
+        cache.update(created)
+        if not _save_assistant_cache(cache):
+            # Without a cache entry nothing will find these again; let the caller
+            # delete them as before.
+            return (
+                [AzureAssistantAgent(client=client, definition=assistant) for _, assistant in resolved],
+                list(created.values()),
+            )
+
+    # Semantic Kernel wraps each assistant so they can be orchestrated uniformly.
+    return [AzureAssistantAgent(client=client, definition=assistant) for _, assistant in resolved], []
+
+
+async def _run_opening_turn(agent: AzureAssistantAgent, prompt: str) -> tuple[str, str]:
+    """Collect one agent's full reply to the prompt outside the group chat."""
+    parts: list[str] = []
+    # The whole turn holds one semaphore slot so concurrent openers cannot
+    # stack unbounded requests on the deployment.
+    async with _get_sem():
+        async for response in agent.invoke(messages=prompt):
+            text = _message_text(response.message).strip()
+            if text:
+                parts.append(text)
+    return agent.name or "", "\n".join(parts)
 
 
 async def stream_group_chat(
@@ -128,63 +323,96 @@ async def stream_group_chat(
     max_rounds: int | None = None,
 ) -> AsyncIterator[tuple[str, str, str]]:
     """Yield transcript entries as the multi-agent chat progresses."""
-    client, deployment_name = _build_client()
+    cfg = _get_config()
+    client, deployment_name = await _get_client()
 
-    keep_created_assistants = (
-        os.getenv("AZURE_OPENAI_KEEP_ASSISTANT", "false").lower() in {"true", "1", "yes"}
-    )
-    resolved_max_rounds = max_rounds or int(os.getenv("SEMANTIC_KERNEL_GROUPCHAT_MAX_ITERATIONS", "4"))
+    resolved_max_rounds = max_rounds or cfg.max_rounds
 
     agents: list[AzureAssistantAgent] = []
-    assistant_ids: list[str] = []
+    uncached_ids: list[str] = []
 
     try:
-        agents, assistant_ids = await _build_agents(
+        agents, uncached_ids = await _build_agents(
             client=client,
             model=deployment_name,
             profiles=ASSISTANT_PROFILES,
         )
 
-        termination_strategy = DefaultTerminationStrategy(maximum_iterations=resolved_max_rounds)
+        yield ("user", prompt, "user")
+
+        # SK's SelectionStrategy picks one agent at a time, so the parallelizable
+        # opening turns bypass the group chat entirely: each opener answers the
+        # prompt concurrently and the replies are folded into the shared history.
+        # The fan-out must leave at least one sequential round within the caller's
+        # budget, otherwise plain sequential orchestration honors max_rounds.
+        openers = [agent for agent in agents if _normalize_name(agent.name) in PARALLEL_OPENERS]
+        opening_turns: list[tuple[str, str]] = []
+        if len(openers) > 1 and resolved_max_rounds > len(openers):
+            opening_turns = await asyncio.gather(*(_run_opening_turn(agent, prompt) for agent in openers))
+        else:
+            openers = []
+
+        # AgentGroupChat is the Semantic Kernel coordinator driving multi-agent
+        # turns; the remaining (synthesis) agents come first so sequential
+        # selection resumes with them instead of repeating the openers.
+        termination_strategy = DefaultTerminationStrategy(
+            maximum_iterations=resolved_max_rounds - len(opening_turns),
+        )
         selection_strategy = SequentialSelectionStrategy()
 
-        # AgentGroupChat is the Semantic Kernel coordinator driving multi-agent turns.
         chat = AgentGroupChat(
-            agents=agents,
+            agents=[agent for agent in agents if agent not in openers] + openers,
             termination_strategy=termination_strategy,
             selection_strategy=selection_strategy,
         )
         await chat.add_chat_message(prompt)
 
-        yield ("user", prompt, "user")
-
         turn = 0
-        async for message in chat.invoke():
-            content = str(message).strip()
+        for name, content in opening_turns:
             if not content:
                 continue
+            turn += 1
+            display_name = _normalize_name(name)
+            # Concurrent turns are collected whole: interleaving two live token
+            # streams would make the transcript unreadable.
+            yield (f"turn {turn}: {display_name}", content, display_name)
+            await chat.add_chat_message(
+                ChatMessageContent(role=AuthorRole.ASSISTANT, name=name, content=content),
+            )
+
+        # invoke_stream yields deltas as Azure streams them, so entries surface
+        # token by token instead of once per fully assembled message. Consumers
+        # coalesce consecutive entries sharing a label when they need whole turns.
+        current_speaker: str | None = None
+        async for chunk in chat.invoke_stream():
+            delta = _message_text(chunk)
+            if not delta:
+                continue
 
-            role_label = message.role.value
-            if message.role == AuthorRole.ASSISTANT:
-                turn += 1
-                display_name = _normalize_name(message.name)
-                role_label = f"turn {turn}: {display_name}".strip()
+            if chunk.role == AuthorRole.ASSISTANT:
+                display_name = _normalize_name(chunk.name)
+                if display_name != current_speaker:
+                    turn += 1
+                    current_speaker = display_name
                 # Each assistant output is color-coded and indented for readability in the terminal.
-                yield (role_label, content, display_name)
+                yield (f"turn {turn}: {display_name}", delta, display_name)
                 continue
 
-            if message.role == AuthorRole.TOOL and not content:
+            current_speaker = None
+            if chunk.role == AuthorRole.TOOL and not delta.strip():
                 continue
 
             # Non-assistant events (tool calls, system notices) still flow through the SK history.
-            yield (role_label, content, "assistant")
+            yield (chunk.role.value, delta, "assistant")
     finally:
-        if not keep_created_assistants:
-            for assistant_id in assistant_ids:
-                # Clean up Azure OpenAI resources once the demo completes.
-                await client.beta.assistants.delete(assistant_id)
-
-        await client.close()
+        if not cfg.keep_assistants:
+            # Cached assistants are reused by later runs, so only assistants that
+            # missed the cache need cleaning up; deletes are independent, so fire
+            # them concurrently and tolerate partial failures.
+            await asyncio.gather(
+                *(_throttled(partial(client.beta.assistants.delete, assistant_id)) for assistant_id in uncached_ids),
+                return_exceptions=True,
+            )
 
 
 async def generate_group_chat_transcript(
@@ -194,23 +422,45 @@ async def generate_group_chat_transcript(
 ) -> list[tuple[str, str, str]]:
     """Return the formatted transcript for a multi-agent conversation."""
     transcript: list[tuple[str, str, str]] = []
-    async for entry in stream_group_chat(prompt, max_rounds=max_rounds):
-        transcript.append(entry)
-    return transcript
+    # stream_group_chat emits per-token deltas; coalesce chunks that share a
+    # label back into one entry per turn for callers that want whole messages.
+    async for label, delta, color_key in stream_group_chat(prompt, max_rounds=max_rounds):
+        if transcript and transcript[-1][0] == label:
+            transcript[-1] = (label, transcript[-1][1] + delta, color_key)
+        else:
+            transcript.append((label, delta, color_key))
+    return [(label, content.strip(), color_key) for label, content, color_key in transcript]
 
 
 async def run_group_chat(prompt: str) -> None:
     """Run a short round-robin group chat across multiple Azure Assistant agents."""
-    transcript = await generate_group_chat_transcript(prompt)
-    for label, content, color_key in transcript:
-        formatted = _colorize(label, content, color_key=color_key)
-        print(formatted)
+    # Consume the stream directly instead of materializing the transcript first,
+    # so the opening turns render while later ones are still being generated.
+    current_label: str | None = None
+    async for label, delta, color_key in stream_group_chat(prompt):
+        if label != current_label:
+            if current_label is not None:
+                sys.stdout.write("\n")
+            sys.stdout.write(f"{_colorize_label(label, color_key=color_key)}\n  ")
+            current_label = label
+        # Re-indent continuation lines inside the delta; no prefix for mid-line chunks.
+        sys.stdout.write(delta.replace("\n", "\n  "))
+        sys.stdout.flush()
+    if current_label is not None:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+
+async def _amain() -> None:
+    try:
+        await run_group_chat(_get_config().prompt)
+    finally:
+        await _close_client()
 
 
 def main() -> None:
     load_dotenv()
-    prompt = os.getenv("SEMANTIC_KERNEL_GROUPCHAT_PROMPT", DEFAULT_PROMPT)
-    asyncio.run(run_group_chat(prompt))
+    asyncio.run(_amain())
 
 
 if __name__ == "__main__":